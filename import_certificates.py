@@ -12,29 +12,72 @@ Usage:
 
 import argparse
 import boto3
+from boto3.dynamodb.types import TypeSerializer
 import openpyxl
 import uuid
 from datetime import datetime
 from dateutil import parser
 import sys
-import json
+import time
+import random
+from itertools import chain, islice
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 
+# Common spreadsheet date layouts, tried with strptime before falling back to dateutil.
+# Slash dates are month-first to match dateutil's default reading of ambiguous values.
+DATE_FORMATS = ('%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S', '%m/%d/%Y')
+
+# Retry schedule for items DynamoDB hands back as unprocessed (throttling)
+MAX_BATCH_ATTEMPTS = 10
+BACKOFF_BASE_SECONDS = 0.05
+
+# DynamoDB attribute <- spreadsheet column for the plain string fields, with the value used when the column is empty
+COLUMN_MAP = (
+    ('SerialNumber', 'Serial Number', ''),
+    ('AccountNumber', 'AccountNumber', ''),
+    ('Application', 'Application', ''),
+    ('Environment', 'ENVIRONMENT', ''),
+    ('Type', 'Type', ''),
+    ('Status', 'Status', 'Unknown'),
+    ('OwnerEmail', 'OwnerEmail', ''),
+    ('SupportEmail', 'Support team Email', ''),
+)
+
+# Columns copied only when the row has a value for them
+OPTIONAL_COLUMNS = ('IncidentNumber', 'RenewedBy', 'RenewalLog', 'UploadS3Key')
+
+# Room for every concurrent batch writer on warm connections; adaptive retries back off on throttling
+boto_config = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 10}
+)
+
+# Python value -> DynamoDB AttributeValue, bound once for the batch write hot path
+serialize = TypeSerializer().serialize
+
+
+@lru_cache(maxsize=8)
+def get_session(region):
+    """One boto3 Session per region, so credentials are resolved once however many clients are built"""
+    return boto3.Session(region_name=region)
+
 
 class CertificateImporter:
     def __init__(self, table_name, region='eu-west-1'):
         self.table_name = table_name
         self.region = region
-        self.dynamodb = None
-        self.table = None
+        self.client = None
         
     def connect_to_dynamodb(self):
         """Initialize DynamoDB connection"""
         try:
-            self.dynamodb = boto3.resource('dynamodb', region_name=self.region)
-            self.table = self.dynamodb.Table(self.table_name)
+            self.client = get_session(self.region).client('dynamodb', config=boto_config)
             # Test connection
-            self.table.table_status
+            self.client.describe_table(TableName=self.table_name)
             print(f"✅ Connected to DynamoDB table: {self.table_name} in {self.region}")
             return True
         except NoCredentialsError:
@@ -59,7 +102,13 @@ class CertificateImporter:
             
             # Handle string dates
             if isinstance(date_value, str):
-                # Try parsing with dateutil
+                for date_format in DATE_FORMATS:
+                    try:
+                        return datetime.strptime(date_value, date_format).strftime('%Y-%m-%d')
+                    except ValueError:
+                        pass
+                
+                # Fall back to dateutil for anything less regular
                 parsed_date = parser.parse(date_value)
                 return parsed_date.strftime('%Y-%m-%d')
                 
@@ -68,133 +117,165 @@ class CertificateImporter:
             return str(date_value) if date_value else None
     
     def read_excel_file(self, file_path):
-        """Read certificates from Excel file"""
+        """Read certificates from Excel file, yielding each one as its row is parsed"""
+        workbook = None
         try:
             print(f"📖 Reading Excel file: {file_path}")
-            workbook = openpyxl.load_workbook(file_path)
+            # Read-only mode streams rows from the XML instead of building the whole sheet in memory
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
             worksheet = workbook.active
+            rows = worksheet.iter_rows(values_only=True)
             
             # Get headers from first row
             headers = []
-            for cell in worksheet[1]:
-                if cell.value:
-                    headers.append(cell.value.strip())
+            for value in next(rows, ()):
+                if value:
+                    headers.append(value.strip())
             
             print(f"📋 Found {len(headers)} columns: {headers}")
-            print(f"📊 Total rows in Excel: {worksheet.max_row}")
             
-            certificates = []
+            processed = 0
             skipped_rows = 0
+            # Every row in one import shares the same timestamp
+            last_updated = datetime.utcnow().isoformat(timespec='seconds') + 'Z'
             
-            # Process data rows (skip header)
-            for row_num in range(2, worksheet.max_row + 1):
-                row_data = {}
-                has_data = False
-                
-                for col_num, header in enumerate(headers, 1):
-                    cell = worksheet.cell(row=row_num, column=col_num)
-                    value = cell.value
-                    
-                    if value is not None:
-                        has_data = True
-                        if isinstance(value, str):
-                            value = value.strip()
-                        row_data[header] = value
-                
-                # Skip completely empty rows
-                if not has_data:
+            # Process data rows (header already consumed)
+            header_count = len(headers)
+            for values in rows:
+                # Skip completely empty rows before building anything; stops at the first filled cell
+                if not any(value is not None for value in values[:header_count]):
                     skipped_rows += 1
                     continue
                 
-                # Generate unique CertificateID
-                certificate_id = f"cert-{str(uuid.uuid4())[:8]}"
+                row_data = {
+                    header: value.strip() if isinstance(value, str) else value
+                    for header, value in zip(headers, values)
+                    if value is not None
+                }
                 
-                # Map Excel columns to DynamoDB attributes
+                # Map Excel columns to DynamoDB attributes, with a unique CertificateID.
+                # Empty strings are left out here so the writer can send items as-is.
                 certificate = {
-                    'CertificateID': certificate_id,
-                    'SerialNumber': str(row_data.get('Serial Number', '')),
-                    'CertificateName': str(row_data.get('Certificate  Name', row_data.get('Certificate Name', ''))),
+                    'CertificateID': f"cert-{uuid.uuid4().hex[:8]}",
                     'ExpiryDate': self.parse_date(row_data.get('Expiry Date')),
-                    'AccountNumber': str(row_data.get('AccountNumber', '')),
-                    'Application': str(row_data.get('Application', '')),
-                    'Environment': str(row_data.get('ENVIRONMENT', '')),
-                    'Type': str(row_data.get('Type', '')),
-                    'Status': str(row_data.get('Status', 'Unknown')),
-                    'OwnerEmail': str(row_data.get('OwnerEmail', '')),
-                    'SupportEmail': str(row_data.get('Support team Email', '')),
-                    'LastUpdatedOn': datetime.utcnow().isoformat() + 'Z'
+                    'LastUpdatedOn': last_updated
                 }
+                certificate_name = str(row_data.get('Certificate  Name', row_data.get('Certificate Name', '')))
+                if certificate_name:
+                    certificate['CertificateName'] = certificate_name
+                for attribute, column, default in COLUMN_MAP:
+                    value = str(row_data.get(column, default))
+                    if value:
+                        certificate[attribute] = value
                 
                 # Add optional fields if present
-                if row_data.get('IncidentNumber'):
-                    certificate['IncidentNumber'] = str(row_data['IncidentNumber'])
-                if row_data.get('RenewedBy'):
-                    certificate['RenewedBy'] = str(row_data['RenewedBy'])
-                if row_data.get('RenewalLog'):
-                    certificate['RenewalLog'] = str(row_data['RenewalLog'])
-                if row_data.get('UploadS3Key'):
-                    certificate['UploadS3Key'] = str(row_data['UploadS3Key'])
+                certificate.update({column: str(row_data[column]) for column in OPTIONAL_COLUMNS if row_data.get(column)})
                 
-                certificates.append(certificate)
+                processed += 1
+                yield certificate
             
-            print(f"✅ Processed {len(certificates)} certificates ({skipped_rows} empty rows skipped)")
-            return certificates
+            print(f"✅ Processed {processed} certificates ({skipped_rows} empty rows skipped)")
             
         except Exception as e:
             print(f"❌ Error reading Excel file: {e}")
-            return []
+            # Rows may already have been handed out; the caller must not treat a truncated stream as complete
+            raise
+        finally:
+            # Read-only workbooks keep the file handle open until closed
+            if workbook is not None:
+                workbook.close()
     
     def preview_certificates(self, certificates, limit=5):
-        """Preview certificates before import"""
+        """Preview certificates before import; any entries past the limit just signal that more follow"""
         print(f"\n📋 PREVIEW: First {min(limit, len(certificates))} certificates:")
         print("=" * 80)
         
         for i, cert in enumerate(certificates[:limit]):
             print(f"\n🔖 Certificate {i+1}:")
             print(f"   ID: {cert['CertificateID']}")
-            print(f"   Name: {cert['CertificateName']}")
-            print(f"   Environment: {cert['Environment']}")
-            print(f"   Application: {cert['Application']}")
+            print(f"   Name: {cert.get('CertificateName', '')}")
+            print(f"   Environment: {cert.get('Environment', '')}")
+            print(f"   Application: {cert.get('Application', '')}")
             print(f"   Expiry: {cert['ExpiryDate']}")
-            print(f"   Status: {cert['Status']}")
-            print(f"   Owner: {cert['OwnerEmail']}")
+            print(f"   Status: {cert.get('Status', '')}")
+            print(f"   Owner: {cert.get('OwnerEmail', '')}")
         
         if len(certificates) > limit:
-            print(f"\n... and {len(certificates) - limit} more certificates")
+            print(f"\n... and more certificates")
         
         print("=" * 80)
     
-    def import_certificates(self, certificates, batch_size=25):
-        """Import certificates to DynamoDB in batches"""
-        if not certificates:
-            print("❌ No certificates to import")
-            return False
+    def write_batch(self, batch):
+        """
+        Write one batch of certificates, resubmitting unprocessed items with exponential backoff.
+        Returns the number of items still unprocessed after the final attempt.
+        """
+        # Empty strings were already dropped by read_excel_file
+        request_items = {self.table_name: [
+            {'PutRequest': {'Item': {k: serialize(v) for k, v in cert.items()}}}
+            for cert in batch
+        ]}
         
-        print(f"\n🚀 Starting import of {len(certificates)} certificates...")
+        for attempt in range(MAX_BATCH_ATTEMPTS):
+            # Unprocessed items come back already serialized and can be resubmitted as-is
+            response = self.client.batch_write_item(RequestItems=request_items)
+            request_items = response.get('UnprocessedItems')
+            if not request_items:
+                return 0
+            if attempt < MAX_BATCH_ATTEMPTS - 1:
+                time.sleep(BACKOFF_BASE_SECONDS * 2 ** attempt + random.uniform(0, BACKOFF_BASE_SECONDS))
+        
+        return len(request_items[self.table_name])
+    
+    def import_certificates(self, certificates, batch_size=25, workers=8):
+        """
+        Import certificates to DynamoDB in batches, several batches in flight at once.
+        Accepts any iterable; batches are cut from it as it's consumed, so the full set is never held in memory.
+        """
+        print(f"\n🚀 Starting import with {workers} concurrent writers...")
         success_count = 0
         error_count = 0
+        pending = {}
         
-        # Process in batches (DynamoDB batch_writer limit is 25)
-        for i in range(0, len(certificates), batch_size):
-            batch = certificates[i:i + batch_size]
-            batch_num = (i // batch_size) + 1
-            total_batches = (len(certificates) + batch_size - 1) // batch_size
-            
-            print(f"📦 Processing batch {batch_num}/{total_batches} ({len(batch)} items)...")
-            
+        def collect(done):
+            nonlocal success_count, error_count
+            for future in done:
+                batch_num, batch_len = pending.pop(future)
+                try:
+                    unprocessed = future.result()
+                    success_count += batch_len - unprocessed
+                    error_count += unprocessed
+                    if unprocessed:
+                        print(f"⚠️  Batch {batch_num}: {unprocessed} items still throttled after {MAX_BATCH_ATTEMPTS} attempts")
+                    else:
+                        print(f"✅ Batch {batch_num} completed successfully ({batch_len} items)")
+                except Exception as e:
+                    print(f"❌ Error in batch {batch_num}: {e}")
+                    error_count += batch_len
+        
+        # Process in batches (DynamoDB BatchWriteItem limit is 25)
+        certificates = iter(certificates)
+        batches = iter(lambda: list(islice(certificates, batch_size)), [])
+        
+        # Batch writes are network-bound, so overlapping them multiplies throughput
+        with ThreadPoolExecutor(max_workers=workers) as executor:
             try:
-                with self.table.batch_writer() as batch_writer:
-                    for cert in batch:
-                        # Remove empty string values to avoid DynamoDB issues
-                        clean_cert = {k: v for k, v in cert.items() if v != ''}
-                        batch_writer.put_item(Item=clean_cert)
-                        success_count += 1
-                
-                print(f"✅ Batch {batch_num} completed successfully")
-                
-            except Exception as e:
-                print(f"❌ Error in batch {batch_num}: {e}")
-                error_count += len(batch)
+                for batch_num, batch in enumerate(batches, 1):
+                    pending[executor.submit(self.write_batch, batch)] = (batch_num, len(batch))
+                    # Cap batches in flight so rows are only read about as fast as they're written
+                    if len(pending) >= workers * 2:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        collect(done)
+            except Exception:
+                # Reading failed mid-stream: let in-flight batches land so the count below is accurate
+                collect(wait(pending).done)
+                print(f"\n❌ Import aborted: {success_count} certificates were written before the error, the rest were not imported")
+                raise
+            collect(wait(pending).done)
+        
+        if not success_count + error_count:
+            print("❌ No certificates to import")
+            return False
         
         print(f"\n📊 Import Summary:")
         print(f"   ✅ Successfully imported: {success_count}")
@@ -211,6 +292,7 @@ def main():
     parser.add_argument('--region', default='eu-west-1', help='AWS region')
     parser.add_argument('--dry-run', action='store_true', help='Preview data without importing')
     parser.add_argument('--preview', type=int, default=5, help='Number of certificates to preview')
+    parser.add_argument('--workers', type=int, default=8, help='Number of concurrent batch writers')
     
     args = parser.parse_args()
     
@@ -220,18 +302,26 @@ def main():
     # Initialize importer
     importer = CertificateImporter(args.table, args.region)
     
-    # Read certificates from Excel
+    # Read certificates from Excel; rows stream in, only the preview is held up front
     certificates = importer.read_excel_file(args.file)
-    if not certificates:
+    try:
+        preview = list(islice(certificates, args.preview + 1))
+    except Exception:
+        preview = []
+    if not preview:
         print("❌ No certificates found or error reading file")
         sys.exit(1)
     
     # Always show preview
-    importer.preview_certificates(certificates, args.preview)
+    importer.preview_certificates(preview, args.preview)
     
     if args.dry_run:
+        try:
+            total = len(preview) + sum(1 for _ in certificates)
+        except Exception:
+            sys.exit(1)
         print(f"\n🔍 DRY RUN MODE - No data will be imported")
-        print(f"📋 Found {len(certificates)} certificates ready for import")
+        print(f"📋 Found {total} certificates ready for import")
         print(f"🎯 Target table: {args.table} in {args.region}")
         print(f"\nTo actually import, run without --dry-run flag")
         return
@@ -241,13 +331,16 @@ def main():
         sys.exit(1)
     
     # Confirm import
-    response = input(f"\n⚠️  Import {len(certificates)} certificates to {args.table}? (y/N): ")
+    response = input(f"\n⚠️  Import certificates from {args.file} to {args.table}? (y/N): ")
     if response.lower() != 'y':
         print("❌ Import cancelled")
         return
     
     # Import certificates
-    success = importer.import_certificates(certificates)
+    try:
+        success = importer.import_certificates(chain(preview, certificates), workers=args.workers)
+    except Exception:
+        sys.exit(1)
     
     if success:
         print(f"\n🎉 Import completed! Certificates are now available in your dashboard:")
@@ -1,18 +1,28 @@
 import json
 import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.config import Config
+from botocore.exceptions import ClientError
 import os
 import uuid
-from datetime import datetime, timedelta
-from decimal import Decimal
+from datetime import datetime, timedelta, timezone
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from collections import Counter, defaultdict
 
 # Configure logging
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
 
-# Initialize AWS clients
-dynamodb = boto3.resource('dynamodb')
-ses = boto3.client('ses')
+# Initialize AWS clients (kept warm across invocations; pool sized for the worker threads)
+boto_config = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={'mode': 'adaptive', 'max_attempts': 3}
+)
+dynamodb = boto3.resource('dynamodb', config=boto_config)
+ses = boto3.client('ses', config=boto_config)
 
 # Environment variables
 CERTIFICATES_TABLE = os.environ['CERTIFICATES_TABLE']
@@ -20,6 +30,31 @@ LOGS_TABLE = os.environ['LOGS_TABLE']
 SENDER_EMAIL = os.environ['SENDER_EMAIL']
 EXPIRY_THRESHOLD = int(os.environ['EXPIRY_THRESHOLD'])
 REGION = os.environ['REGION']
+NOTIFICATION_WORKERS = int(os.environ.get('NOTIFICATION_WORKERS', '8'))
+QUERY_WORKERS = int(os.environ.get('QUERY_WORKERS', '8'))
+STATUS_UPDATE_WORKERS = int(os.environ.get('STATUS_UPDATE_WORKERS', '16'))
+
+# GSI keyed on ExpiryDate, and the attributes the monitor reads from each certificate
+EXPIRY_INDEX = 'ExpiryIndex'
+MONITOR_FIELDS = ('CertificateID', 'CertificateName', 'Environment', 'Application',
+                  'ExpiryDate', 'OwnerEmail', 'SupportEmail', 'Status')
+MONITOR_PROJECTION = ', '.join(f'#{field}' for field in MONITOR_FIELDS)
+MONITOR_ATTR_NAMES = {f'#{field}': field for field in MONITOR_FIELDS}
+
+# Status update applied by the monitor; only the values differ per certificate
+STATUS_UPDATE_EXPRESSION = 'SET #status = :status, LastUpdatedOn = :timestamp'
+STATUS_UPDATE_CONDITION = 'attribute_not_exists(#status) OR #status = :current_status'
+STATUS_ATTR_NAMES = {'#status': 'Status'}
+
+# Statuses set by hand from the dashboard; the monitor never overrides them
+MANUAL_STATUSES = frozenset(("Renewal in Progress", "Renewal Done"))
+
+# DynamoDB table handles, created once per container
+certificates_table = dynamodb.Table(CERTIFICATES_TABLE)
+logs_table = dynamodb.Table(LOGS_TABLE)
+
+# Worker threads go through the table's underlying client: clients are thread-safe, resources are not
+certificates_client = certificates_table.meta.client
 
 def lambda_handler(event, context):
     """
@@ -27,18 +62,23 @@ def lambda_handler(event, context):
     """
     logger.info("Certificate monitor started")
     
+    # Read the clock once per run so every comparison and timestamp agrees
+    now = datetime.now(timezone.utc)
+    
     try:
         # Scan certificates table for expiring certificates
-        expiring_certificates = scan_expiring_certificates()
+        expiring_certificates = scan_expiring_certificates(now)
         
-        # Process notifications
-        notification_results = process_notifications(expiring_certificates)
-        
-        # Update certificate statuses
-        status_update_results = update_certificate_statuses(expiring_certificates)
+        # Send notifications and update statuses concurrently - both are network-bound
+        # (SES vs DynamoDB) and only read the scanned certificate data
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            notification_future = executor.submit(process_notifications, expiring_certificates, now)
+            status_update_future = executor.submit(update_certificate_statuses, expiring_certificates, now)
+            notification_results = notification_future.result()
+            status_update_results = status_update_future.result()
         
         # Create summary report
-        summary = create_summary_report(expiring_certificates, notification_results, status_update_results)
+        summary = create_summary_report(expiring_certificates, notification_results, status_update_results, now)
         
         logger.info(f"Certificate monitoring completed. Summary: {summary}")
         
@@ -47,7 +87,7 @@ def lambda_handler(event, context):
             'body': json.dumps({
                 'message': 'Certificate monitoring completed successfully',
                 'summary': summary,
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': now.isoformat()
             })
         }
         
@@ -57,67 +97,62 @@ def lambda_handler(event, context):
             'statusCode': 500,
             'body': json.dumps({
                 'error': str(e),
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': now.isoformat()
             })
         }
 
-def scan_expiring_certificates():
+def scan_expiring_certificates(now):
     """
-    Scan DynamoDB for certificates that are expiring within the threshold
+    Query DynamoDB for certificates that are expiring within the threshold
     """
-    certificates_table = dynamodb.Table(CERTIFICATES_TABLE)
-    
     # Calculate threshold date
-    threshold_date = (datetime.utcnow() + timedelta(days=EXPIRY_THRESHOLD)).strftime('%Y-%m-%d')
-    current_date = datetime.utcnow().strftime('%Y-%m-%d')
+    today = now.date()
+    threshold_date = (today + timedelta(days=EXPIRY_THRESHOLD)).strftime('%Y-%m-%d')
+    current_date = today.strftime('%Y-%m-%d')
     
-    logger.info(f"Scanning for certificates expiring between {current_date} and {threshold_date}")
+    logger.info(f"Querying for certificates expiring between {current_date} and {threshold_date}")
     
     expiring_certificates = []
     
     try:
-        # Scan all certificates (for now - can be optimized with GSI)
-        response = certificates_table.scan()
-        
-        for item in response['Items']:
-            expiry_date = item.get('ExpiryDate')
-            if expiry_date and is_certificate_expiring(expiry_date, current_date, threshold_date):
-                expiring_certificates.append(item)
+        # ExpiryIndex is keyed on ExpiryDate alone, so query each day of the window
+        # rather than scanning the whole table; the per-day queries run concurrently
+        expiry_dates = [(today + timedelta(days=offset)).strftime('%Y-%m-%d') for offset in range(EXPIRY_THRESHOLD + 1)]
         
-        # Handle pagination
-        while 'LastEvaluatedKey' in response:
-            response = certificates_table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-            for item in response['Items']:
-                expiry_date = item.get('ExpiryDate')
-                if expiry_date and is_certificate_expiring(expiry_date, current_date, threshold_date):
-                    expiring_certificates.append(item)
+        with ThreadPoolExecutor(max_workers=QUERY_WORKERS) as executor:
+            for certificates in executor.map(query_certificates_by_expiry_date, expiry_dates):
+                expiring_certificates.extend(certificates)
     
     except Exception as e:
-        logger.error(f"Error scanning certificates: {str(e)}")
+        logger.error(f"Error querying certificates: {str(e)}")
         raise
     
     logger.info(f"Found {len(expiring_certificates)} expiring certificates")
     return expiring_certificates
 
-def is_certificate_expiring(expiry_date, current_date, threshold_date):
+def query_certificates_by_expiry_date(expiry_date):
     """
-    Check if certificate is expiring within the threshold period
+    Fetch all certificates expiring on a single date from the ExpiryIndex GSI
     """
-    try:
-        expiry = datetime.strptime(expiry_date, '%Y-%m-%d')
-        current = datetime.strptime(current_date, '%Y-%m-%d')
-        threshold = datetime.strptime(threshold_date, '%Y-%m-%d')
-        
-        # Certificate is expiring if:
-        # 1. It expires within the threshold period
-        # 2. It's not already expired (we handle expired separately)
-        return current <= expiry <= threshold
-        
-    except ValueError as e:
-        logger.warning(f"Invalid date format for certificate expiry: {expiry_date}")
-        return False
+    query_kwargs = {
+        'TableName': CERTIFICATES_TABLE,
+        'IndexName': EXPIRY_INDEX,
+        'KeyConditionExpression': Key('ExpiryDate').eq(expiry_date),
+        'ProjectionExpression': MONITOR_PROJECTION,
+        'ExpressionAttributeNames': MONITOR_ATTR_NAMES
+    }
+    
+    response = certificates_client.query(**query_kwargs)
+    certificates = response['Items']
+    
+    # Handle pagination
+    while 'LastEvaluatedKey' in response:
+        response = certificates_client.query(ExclusiveStartKey=response['LastEvaluatedKey'], **query_kwargs)
+        certificates.extend(response['Items'])
+    
+    return certificates
 
-def process_notifications(expiring_certificates):
+def process_notifications(expiring_certificates, now):
     """
     Send email notifications for expiring certificates
     """
@@ -127,31 +162,57 @@ def process_notifications(expiring_certificates):
         'errors': []
     }
     
+    log_entries = []
+    
     # Group certificates by owner for batched notifications
     certificates_by_owner = group_certificates_by_owner(expiring_certificates)
     
-    for owner_email, certificates in certificates_by_owner.items():
-        try:
-            if owner_email and '@' in owner_email:
-                send_expiry_notification(owner_email, certificates)
+    # Render and send each recipient's email on a worker so body generation overlaps SES calls
+    with ThreadPoolExecutor(max_workers=NOTIFICATION_WORKERS) as executor:
+        outcomes = executor.map(notify_owner, certificates_by_owner.keys(), certificates_by_owner.values(), repeat(now))
+        
+        for owner_log_entries, error_msg in outcomes:
+            if owner_log_entries:
+                log_entries.extend(owner_log_entries)
                 notification_results['sent'] += 1
-                logger.info(f"Notification sent to {owner_email} for {len(certificates)} certificates")
-            else:
-                logger.warning(f"Invalid or missing owner email for certificates: {[cert.get('CertificateName') for cert in certificates]}")
-                
-        except Exception as e:
-            error_msg = f"Failed to send notification to {owner_email}: {str(e)}"
-            logger.error(error_msg)
-            notification_results['failed'] += 1
-            notification_results['errors'].append(error_msg)
+            elif error_msg:
+                notification_results['failed'] += 1
+                notification_results['errors'].append(error_msg)
+    
+    # Log every sent notification in one bulk write, from this thread rather than the workers
+    log_notifications(log_entries)
     
     return notification_results
 
+def notify_owner(owner_email, certificates, now):
+    """
+    Send the notification for one recipient. Returns (log_entries, error_message).
+    """
+    try:
+        if owner_email and '@' in owner_email:
+            send_expiry_notification(owner_email, certificates, now)
+            logger.info(f"Notification sent to {owner_email} for {len(certificates)} certificates")
+            
+            # Notification log entries, written in bulk by the caller
+            timestamp = now.isoformat()
+            return [
+                create_log_entry(cert['CertificateID'], owner_email, 'EMAIL_NOTIFICATION_SENT', timestamp)
+                for cert in certificates
+            ], None
+        
+        logger.warning(f"Invalid or missing owner email for certificates: {[cert.get('CertificateName') for cert in certificates]}")
+        return None, None
+        
+    except Exception as e:
+        error_msg = f"Failed to send notification to {owner_email}: {str(e)}"
+        logger.error(error_msg)
+        return None, error_msg
+
 def group_certificates_by_owner(certificates):
     """
     Group certificates by owner email for batched notifications
     """
-    certificates_by_owner = {}
+    certificates_by_owner = defaultdict(list)
     
     for cert in certificates:
         owner_email = cert.get('OwnerEmail', '').strip()
@@ -159,28 +220,30 @@ def group_certificates_by_owner(certificates):
         
         # Primary notification to owner
         if owner_email:
-            if owner_email not in certificates_by_owner:
-                certificates_by_owner[owner_email] = []
             certificates_by_owner[owner_email].append(cert)
         
         # Secondary notification to support team if different
         if support_email and support_email != owner_email:
-            if support_email not in certificates_by_owner:
-                certificates_by_owner[support_email] = []
             certificates_by_owner[support_email].append(cert)
     
-    return certificates_by_owner
+    return dict(certificates_by_owner)
 
-def send_expiry_notification(recipient_email, certificates):
+def send_expiry_notification(recipient_email, certificates, now):
     """
     Send email notification about expiring certificates
     """
     # Create email content
     subject = f"Certificate Expiry Alert - {len(certificates)} Certificate(s) Expiring Soon"
     
+    # Days until expiry are computed once per certificate and shared by both bodies
+    certificate_days = [
+        (cert, calculate_days_until_expiry(cert.get('ExpiryDate', 'Unknown'), now))
+        for cert in certificates
+    ]
+    
     # Generate email body
-    body_text = generate_email_body_text(certificates)
-    body_html = generate_email_body_html(certificates)
+    body_text = generate_email_body_text(certificate_days)
+    body_html = generate_email_body_html(certificate_days)
     
     # Send email via SES
     response = ses.send_email(
@@ -195,40 +258,29 @@ def send_expiry_notification(recipient_email, certificates):
         }
     )
     
-    # Log the notification
-    for cert in certificates:
-        log_notification(cert['CertificateID'], recipient_email, 'EMAIL_NOTIFICATION_SENT')
-    
     return response
 
-def generate_email_body_text(certificates):
-    """
-    Generate plain text email body
-    """
-    body = f"""
+# Email templates, built once at import; only the per-certificate fields vary per call
+EMAIL_TEXT_HEADER = """
 Certificate Expiry Alert
 
-This is an automated notification that {len(certificates)} certificate(s) are expiring within the next {EXPIRY_THRESHOLD} days.
+This is an automated notification that {count} certificate(s) are expiring within the next {threshold} days.
 
 Please take immediate action to renew the following certificates:
 
 """
-    
-    for cert in certificates:
-        expiry_date = cert.get('ExpiryDate', 'Unknown')
-        days_until_expiry = calculate_days_until_expiry(expiry_date)
-        
-        body += f"""
-Certificate: {cert.get('CertificateName', 'Unknown')}
-Environment: {cert.get('Environment', 'Unknown')}
-Application: {cert.get('Application', 'Unknown')}
+
+EMAIL_TEXT_ROW = """
+Certificate: {name}
+Environment: {environment}
+Application: {application}
 Expiry Date: {expiry_date}
-Days Until Expiry: {days_until_expiry}
-Status: {cert.get('Status', 'Unknown')}
+Days Until Expiry: {days}
+Status: {status}
 ---
 """
-    
-    body += f"""
+
+EMAIL_TEXT_FOOTER = """
 
 Next Steps:
 1. Create a ServiceNow ticket for certificate renewal
@@ -240,32 +292,28 @@ Dashboard: Access the certificate management dashboard for more details
 
 This is an automated message from the Certificate Management System.
 """
-    
-    return body
 
-def generate_email_body_html(certificates):
-    """
-    Generate HTML email body
-    """
-    html = f"""
+EMAIL_HTML_HEAD = """
 <html>
 <head>
     <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; }}
-        .header {{ background-color: #f44336; color: white; padding: 15px; border-radius: 5px; }}
-        .certificate {{ background-color: #f9f9f9; padding: 10px; margin: 10px 0; border-left: 4px solid #ff9800; }}
-        .urgent {{ border-left-color: #f44336; }}
-        .warning {{ border-left-color: #ff9800; }}
-        .footer {{ background-color: #e0e0e0; padding: 10px; margin-top: 20px; border-radius: 5px; }}
-        table {{ border-collapse: collapse; width: 100%; }}
-        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-        th {{ background-color: #f2f2f2; }}
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        .header { background-color: #f44336; color: white; padding: 15px; border-radius: 5px; }
+        .certificate { background-color: #f9f9f9; padding: 10px; margin: 10px 0; border-left: 4px solid #ff9800; }
+        .urgent { border-left-color: #f44336; }
+        .warning { border-left-color: #ff9800; }
+        .footer { background-color: #e0e0e0; padding: 10px; margin-top: 20px; border-radius: 5px; }
+        table { border-collapse: collapse; width: 100%; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        th { background-color: #f2f2f2; }
     </style>
 </head>
 <body>
-    <div class="header">
+"""
+
+EMAIL_HTML_HEADER = """    <div class="header">
         <h2>🚨 Certificate Expiry Alert</h2>
-        <p>This is an automated notification that {len(certificates)} certificate(s) are expiring within the next {EXPIRY_THRESHOLD} days.</p>
+        <p>This is an automated notification that {count} certificate(s) are expiring within the next {threshold} days.</p>
     </div>
     
     <h3>Certificates Requiring Immediate Attention:</h3>
@@ -281,27 +329,20 @@ def generate_email_body_html(certificates):
             <th>Status</th>
         </tr>
 """
-    
-    for cert in certificates:
-        expiry_date = cert.get('ExpiryDate', 'Unknown')
-        days_until_expiry = calculate_days_until_expiry(expiry_date)
-        
-        # Determine urgency class
-        urgency_class = "urgent" if days_until_expiry < 7 else "warning"
-        
-        html += f"""
+
+EMAIL_HTML_ROW = """
         <tr class="{urgency_class}">
-            <td>{cert.get('CertificateName', 'Unknown')}</td>
-            <td>{cert.get('Environment', 'Unknown')}</td>
-            <td>{cert.get('Application', 'Unknown')}</td>
+            <td>{name}</td>
+            <td>{environment}</td>
+            <td>{application}</td>
             <td>{expiry_date}</td>
-            <td>{days_until_expiry}</td>
-            <td>{cert.get('OwnerEmail', 'Unknown')}</td>
-            <td>{cert.get('Status', 'Unknown')}</td>
+            <td>{days}</td>
+            <td>{owner}</td>
+            <td>{status}</td>
         </tr>
 """
-    
-    html += """
+
+EMAIL_HTML_FOOTER = """
     </table>
     
     <div class="footer">
@@ -318,98 +359,161 @@ def generate_email_body_html(certificates):
 </body>
 </html>
 """
-    
-    return html
 
-def calculate_days_until_expiry(expiry_date):
+def generate_email_body_text(certificate_days):
+    """
+    Generate plain text email body from (certificate, days_until_expiry) pairs
+    """
+    parts = [EMAIL_TEXT_HEADER.format(count=len(certificate_days), threshold=EXPIRY_THRESHOLD)]
+    
+    for cert, days_until_expiry in certificate_days:
+        parts.append(EMAIL_TEXT_ROW.format(
+            name=cert.get('CertificateName', 'Unknown'),
+            environment=cert.get('Environment', 'Unknown'),
+            application=cert.get('Application', 'Unknown'),
+            expiry_date=cert.get('ExpiryDate', 'Unknown'),
+            days=days_until_expiry,
+            status=cert.get('Status', 'Unknown')
+        ))
+    
+    parts.append(EMAIL_TEXT_FOOTER)
+    return ''.join(parts)
+
+def generate_email_body_html(certificate_days):
+    """
+    Generate HTML email body from (certificate, days_until_expiry) pairs
+    """
+    parts = [
+        EMAIL_HTML_HEAD,
+        EMAIL_HTML_HEADER.format(count=len(certificate_days), threshold=EXPIRY_THRESHOLD)
+    ]
+    
+    for cert, days_until_expiry in certificate_days:
+        parts.append(EMAIL_HTML_ROW.format(
+            # Determine urgency class
+            urgency_class="urgent" if days_until_expiry < 7 else "warning",
+            name=cert.get('CertificateName', 'Unknown'),
+            environment=cert.get('Environment', 'Unknown'),
+            application=cert.get('Application', 'Unknown'),
+            expiry_date=cert.get('ExpiryDate', 'Unknown'),
+            days=days_until_expiry,
+            owner=cert.get('OwnerEmail', 'Unknown'),
+            status=cert.get('Status', 'Unknown')
+        ))
+    
+    parts.append(EMAIL_HTML_FOOTER)
+    return ''.join(parts)
+
+def calculate_days_until_expiry(expiry_date, now):
     """
-    Calculate days until certificate expiry
+    Calculate days until certificate expiry relative to the run's UTC time
     """
     try:
-        expiry = datetime.strptime(expiry_date, '%Y-%m-%d')
-        current = datetime.utcnow()
-        return (expiry - current).days
+        expiry = datetime.fromisoformat(expiry_date).replace(tzinfo=timezone.utc)
+        return (expiry - now).days
     except ValueError:
         return "Unknown"
 
-def update_certificate_statuses(expiring_certificates):
+def update_certificate_statuses(expiring_certificates, now):
     """
     Update certificate statuses based on expiry dates
     """
-    certificates_table = dynamodb.Table(CERTIFICATES_TABLE)
-    
     update_results = {
         'updated': 0,
         'failed': 0,
         'errors': []
     }
     
-    for cert in expiring_certificates:
-        try:
-            cert_id = cert['CertificateID']
-            expiry_date = cert.get('ExpiryDate')
-            current_status = cert.get('Status', '')
-            
-            # Calculate new status
-            new_status = calculate_new_status(expiry_date, current_status)
-            
-            if new_status != current_status:
-                # Update certificate status
-                certificates_table.update_item(
-                    Key={'CertificateID': cert_id},
-                    UpdateExpression='SET #status = :status, LastUpdatedOn = :timestamp',
-                    ExpressionAttributeNames={'#status': 'Status'},
-                    ExpressionAttributeValues={
-                        ':status': new_status,
-                        ':timestamp': datetime.utcnow().isoformat()
-                    }
-                )
-                
-                # Log the status change
-                log_notification(cert_id, 'system', f'STATUS_CHANGED_FROM_{current_status}_TO_{new_status}')
-                
+    log_entries = []
+    
+    # Each update is an independent DynamoDB round trip, so issue them concurrently
+    with ThreadPoolExecutor(max_workers=STATUS_UPDATE_WORKERS) as executor:
+        outcomes = executor.map(update_certificate_status, expiring_certificates, repeat(now))
+        
+        for log_entry, error_msg in outcomes:
+            if log_entry:
+                log_entries.append(log_entry)
                 update_results['updated'] += 1
-                logger.info(f"Updated certificate {cert.get('CertificateName')} status from {current_status} to {new_status}")
-            
-        except Exception as e:
-            error_msg = f"Failed to update status for certificate {cert.get('CertificateID')}: {str(e)}"
-            logger.error(error_msg)
-            update_results['failed'] += 1
-            update_results['errors'].append(error_msg)
+            elif error_msg:
+                update_results['failed'] += 1
+                update_results['errors'].append(error_msg)
+    
+    # Log all status changes in one bulk write
+    log_notifications(log_entries)
     
     return update_results
 
-def calculate_new_status(expiry_date, current_status):
+def update_certificate_status(cert, now):
     """
-    Calculate new certificate status based on expiry date
+    Update the status of a single certificate if it changed. Returns (log_entry, error_message).
     """
     try:
-        expiry = datetime.strptime(expiry_date, '%Y-%m-%d')
-        current = datetime.utcnow()
-        days_until_expiry = (expiry - current).days
+        cert_id = cert['CertificateID']
+        expiry_date = cert.get('ExpiryDate')
+        current_status = cert.get('Status', '')
         
-        if days_until_expiry < 0:
-            return "Expired"
-        elif days_until_expiry <= EXPIRY_THRESHOLD and current_status not in ["Renewal in Progress", "Renewal Done"]:
-            return "Due for Renewal"
-        elif current_status in ["Renewal in Progress", "Renewal Done"]:
-            return current_status  # Don't change manual statuses
-        else:
-            return "Active"
-            
-    except ValueError:
-        return current_status  # Keep current status if date parsing fails
+        # Calculate new status
+        new_status = calculate_new_status(calculate_days_until_expiry(expiry_date, now), current_status)
+        
+        if new_status == current_status:
+            return None, None
+        
+        # Update certificate status, only if nobody changed it since the scan
+        # (e.g. an owner setting "Renewal in Progress" from the dashboard)
+        timestamp = now.isoformat()
+        try:
+            certificates_client.update_item(
+                TableName=CERTIFICATES_TABLE,
+                Key={'CertificateID': cert_id},
+                UpdateExpression=STATUS_UPDATE_EXPRESSION,
+                ConditionExpression=STATUS_UPDATE_CONDITION,
+                ExpressionAttributeNames=STATUS_ATTR_NAMES,
+                ExpressionAttributeValues={
+                    ':status': new_status,
+                    ':current_status': current_status,
+                    ':timestamp': timestamp
+                }
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                logger.info(f"Skipped status update for certificate {cert_id}: status changed since scan")
+                return None, None
+            raise
+        
+        logger.debug(f"Updated certificate {cert.get('CertificateName')} status from {current_status} to {new_status}")
+        
+        # Status change log entry, written in bulk by the caller
+        return create_log_entry(cert_id, 'system', f'STATUS_CHANGED_FROM_{current_status}_TO_{new_status}', timestamp), None
+        
+    except Exception as e:
+        error_msg = f"Failed to update status for certificate {cert.get('CertificateID')}: {str(e)}"
+        logger.error(error_msg)
+        return None, error_msg
 
-def log_notification(cert_id, recipient, action):
+def calculate_new_status(days_until_expiry, current_status):
     """
-    Log notification or status change to the logs table
+    Calculate new certificate status from the precomputed days until expiry
     """
-    logs_table = dynamodb.Table(LOGS_TABLE)
-    
-    log_entry = {
+    if not isinstance(days_until_expiry, int):
+        return current_status  # Keep current status if date parsing failed
+    
+    if days_until_expiry < 0:
+        return "Expired"
+    elif days_until_expiry <= EXPIRY_THRESHOLD and current_status not in MANUAL_STATUSES:
+        return "Due for Renewal"
+    elif current_status in MANUAL_STATUSES:
+        return current_status  # Don't change manual statuses
+    else:
+        return "Active"
+
+def create_log_entry(cert_id, recipient, action, timestamp):
+    """
+    Build a notification or status change entry for the logs table
+    """
+    return {
         'LogID': str(uuid.uuid4()),
         'CertificateID': cert_id,
-        'Timestamp': datetime.utcnow().isoformat(),
+        'Timestamp': timestamp,
         'Action': action,
         'Details': {
             'recipient': recipient,
@@ -421,18 +525,24 @@ def log_notification(cert_id, recipient, action):
             'version': '1.0'
         }
     }
-    
+
+def log_notifications(log_entries):
+    """
+    Write log entries to the logs table in bulk (25 items per BatchWriteItem request)
+    """
     try:
-        logs_table.put_item(Item=log_entry)
+        with logs_table.batch_writer() as batch:
+            for log_entry in log_entries:
+                batch.put_item(Item=log_entry)
     except Exception as e:
-        logger.error(f"Failed to log notification: {str(e)}")
+        logger.error(f"Failed to log notifications: {str(e)}")
 
-def create_summary_report(expiring_certificates, notification_results, status_update_results):
+def create_summary_report(expiring_certificates, notification_results, status_update_results, now):
     """
     Create a summary report of the monitoring run
     """
     return {
-        'monitoring_timestamp': datetime.utcnow().isoformat(),
+        'monitoring_timestamp': now.isoformat(),
         'expiry_threshold_days': EXPIRY_THRESHOLD,
         'certificates_found': len(expiring_certificates),
         'notifications': notification_results,
@@ -440,7 +550,7 @@ def create_summary_report(expiring_certificates, notification_results, status_up
         'certificate_breakdown': {
             'by_environment': count_by_field(expiring_certificates, 'Environment'),
             'by_status': count_by_field(expiring_certificates, 'Status'),
-            'by_urgency': categorize_by_urgency(expiring_certificates)
+            'by_urgency': categorize_by_urgency(expiring_certificates, now)
         }
     }
 
@@ -448,13 +558,9 @@ def count_by_field(certificates, field):
     """
     Count certificates by a specific field
     """
-    counts = {}
-    for cert in certificates:
-        value = cert.get(field, 'Unknown')
-        counts[value] = counts.get(value, 0) + 1
-    return counts
+    return dict(Counter(cert.get(field, 'Unknown') for cert in certificates))
 
-def categorize_by_urgency(certificates):
+def categorize_by_urgency(certificates, now):
     """
     Categorize certificates by urgency (days until expiry)
     """
@@ -462,7 +568,7 @@ def categorize_by_urgency(certificates):
     warning = 0  # 7-30 days
     
     for cert in certificates:
-        days_until_expiry = calculate_days_until_expiry(cert.get('ExpiryDate', ''))
+        days_until_expiry = calculate_days_until_expiry(cert.get('ExpiryDate', ''), now)
         if isinstance(days_until_expiry, int):
             if days_until_expiry < 7:
                 urgent += 1
@@ -2,7 +2,18 @@ import json
 import boto3
 import uuid
 from decimal import Decimal
-from datetime import datetime, date
+from datetime import datetime, date, timezone
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+
+# Created once per container and reused across warm invocations
+dynamodb = boto3.resource('dynamodb')
+table = dynamodb.Table('cert-management-dev-certificates')
+logs_table = dynamodb.Table('cert-management-dev-certificate-logs')
+
+# The GET scans the table as parallel segments, each paging through its own LastEvaluatedKey
+SCAN_SEGMENTS = 4
+scan_executor = ThreadPoolExecutor(max_workers=SCAN_SEGMENTS)
 
 def lambda_handler(event, context):
     """
@@ -17,11 +28,6 @@ def lambda_handler(event, context):
     - PUT: Update existing certificate
     """
     
-    # Initialize DynamoDB
-    dynamodb = boto3.resource('dynamodb')
-    table = dynamodb.Table('cert-management-dev-certificates')
-    logs_table = dynamodb.Table('cert-management-dev-certificate-logs')
-    
     # Get HTTP method
     http_method = event.get('requestContext', {}).get('http', {}).get('method', 'GET')
     
@@ -51,23 +57,11 @@ def handle_get_certificates(table):
     """Handle GET request - fetch all certificates"""
     try:
         # Get all certificates
-        response = table.scan()
-        certificates = response['Items']
-        
-        # Convert Decimal types to regular numbers for JSON serialization
-        def convert_decimal(obj):
-            if isinstance(obj, Decimal):
-                return float(obj)
-            elif isinstance(obj, (datetime, date)):
-                return obj.isoformat()
-            elif isinstance(obj, dict):
-                return {k: convert_decimal(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_decimal(item) for item in obj]
-            return obj
-        
-        # Convert all certificates
-        json_certificates = convert_decimal(certificates)
+        certificates = [
+            item
+            for segment_items in scan_executor.map(scan_segment, repeat(table), range(SCAN_SEGMENTS))
+            for item in segment_items
+        ]
         
         # Return response WITHOUT CORS headers (handled by Lambda Function URL config)
         return {
@@ -76,10 +70,10 @@ def handle_get_certificates(table):
                 'Content-Type': 'application/json'
             },
             'body': json.dumps({
-                'certificates': json_certificates,
+                'certificates': certificates,
                 'count': len(certificates),
                 'timestamp': datetime.utcnow().isoformat() + 'Z'
-            })
+            }, default=json_default)
         }
         
     except Exception as e:
@@ -95,6 +89,18 @@ def handle_get_certificates(table):
             })
         }
 
+def scan_segment(table, segment):
+    """Scan one segment of the table to completion"""
+    # Resources aren't thread-safe, so workers go through the table's underlying client
+    client = table.meta.client
+    segment_kwargs = {'TableName': table.name, 'Segment': segment, 'TotalSegments': SCAN_SEGMENTS}
+    response = client.scan(**segment_kwargs)
+    items = response['Items']
+    while 'LastEvaluatedKey' in response:
+        response = client.scan(ExclusiveStartKey=response['LastEvaluatedKey'], **segment_kwargs)
+        items.extend(response['Items'])
+    return items
+
 def handle_add_certificate(event, table, logs_table):
     """Handle POST request - add new certificate"""
     try:
@@ -120,8 +126,7 @@ def handle_add_certificate(event, table, logs_table):
         
         # Calculate status based on expiry date
         expiry_date = body.get('ExpiryDate')
-        status = calculate_status(expiry_date)
-        days_until_expiry = calculate_days_until_expiry(expiry_date)
+        status, days_until_expiry = calculate_expiry(expiry_date)
         
         # Prepare certificate data
         current_time = datetime.utcnow().isoformat() + 'Z'
@@ -198,14 +203,16 @@ def handle_update_certificate(event, table, logs_table):
         
         # Calculate status if expiry date is provided
         if body.get('ExpiryDate'):
-            body['Status'] = calculate_status(body['ExpiryDate'])
-            body['DaysUntilExpiry'] = str(calculate_days_until_expiry(body['ExpiryDate']))
+            status, days_until_expiry = calculate_expiry(body['ExpiryDate'])
+            body['Status'] = status
+            body['DaysUntilExpiry'] = str(days_until_expiry)
         
         # Update timestamp
-        body['LastUpdatedOn'] = datetime.utcnow().isoformat() + 'Z'
+        current_time = datetime.utcnow().isoformat() + 'Z'
+        body['LastUpdatedOn'] = current_time
         
         # Build update expression
-        update_expr = "SET "
+        set_clauses = []
         expr_attr_values = {}
         expr_attr_names = {}
         
@@ -213,12 +220,11 @@ def handle_update_certificate(event, table, logs_table):
             if key != 'CertificateID' and value not in [None, '', 'None']:
                 attr_name = f"#{key}"
                 attr_value = f":{key}"
-                update_expr += f"{attr_name} = {attr_value}, "
+                set_clauses.append(f"{attr_name} = {attr_value}")
                 expr_attr_names[attr_name] = key
                 expr_attr_values[attr_value] = value
         
-        # Remove trailing comma
-        update_expr = update_expr.rstrip(', ')
+        update_expr = "SET " + ", ".join(set_clauses)
         
         # Update in DynamoDB
         table.update_item(
@@ -233,7 +239,7 @@ def handle_update_certificate(event, table, logs_table):
             'LogID': f"log-{str(uuid.uuid4())}",
             'CertificateID': cert_id,
             'Action': 'UPDATE',
-            'Timestamp': datetime.utcnow().isoformat() + 'Z',
+            'Timestamp': current_time,
             'Details': f"Certificate updated via dashboard",
             'PerformedBy': body.get('OwnerEmail', 'Unknown')
         }
@@ -259,35 +265,36 @@ def handle_update_certificate(event, table, logs_table):
             })
         }
 
-def calculate_status(expiry_date):
-    """Calculate certificate status based on expiry date"""
+def calculate_expiry(expiry_date):
+    """Parse the expiry date once and return (status, days until expiry)"""
     try:
         expiry = datetime.fromisoformat(expiry_date.replace('Z', ''))
-        today = datetime.utcnow()
-        days_left = (expiry - today).days
-        
-        if days_left < 0:
-            return 'Expired'
-        elif days_left <= 30:
-            return 'Due for Renewal'
-        else:
-            return 'Active'
-    except:
-        return 'Unknown'
+        if expiry.tzinfo is not None:
+            expiry = expiry.astimezone(timezone.utc).replace(tzinfo=None)
+        days_left = (expiry - datetime.utcnow()).days
+    except (ValueError, TypeError, AttributeError):
+        return 'Unknown', 0
+    
+    if days_left < 0:
+        return 'Expired', days_left
+    elif days_left <= 30:
+        return 'Due for Renewal', days_left
+    else:
+        return 'Active', days_left
 
-def calculate_days_until_expiry(expiry_date):
-    """Calculate days until expiry"""
-    try:
-        expiry = datetime.fromisoformat(expiry_date.replace('Z', ''))
-        today = datetime.utcnow()
-        days_left = (expiry - today).days
-        return days_left
-    except:
-        return 0
+def json_default(obj):
+    """json.dumps hook for the types DynamoDB hands back that json can't encode itself"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    elif isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 def convert_decimal(obj):
     """Convert Decimal types to regular numbers for JSON serialization"""
-    if isinstance(obj, Decimal):
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj  # Scalars pass straight through without further type checks
+    elif isinstance(obj, Decimal):
         return float(obj)
     elif isinstance(obj, (datetime, date)):
         return obj.isoformat()
@@ -1,15 +1,16 @@
 import json
 import boto3
+from botocore.exceptions import ClientError
 import pandas as pd
 import os
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 from io import BytesIO
 import logging
 
 # Configure logging
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
 
 # Initialize AWS clients
 dynamodb = boto3.resource('dynamodb')
@@ -21,6 +22,13 @@ LOGS_TABLE = os.environ['LOGS_TABLE']
 LOGS_BUCKET = os.environ['LOGS_BUCKET']
 REGION = os.environ['REGION']
 
+# DynamoDB table handles, created once per container
+certificates_table = dynamodb.Table(CERTIFICATES_TABLE)
+logs_table = dynamodb.Table(LOGS_TABLE)
+
+# Rows are written in batches of this size (the BatchWriteItem limit)
+WRITE_BATCH_SIZE = 25
+
 def lambda_handler(event, context):
     """
     Process Excel file uploaded to S3 and populate DynamoDB certificates table
@@ -77,39 +85,51 @@ def process_excel_file(bucket, key):
     df = df.rename(columns=column_mapping)
     
     # Process each row
-    certificates_table = dynamodb.Table(CERTIFICATES_TABLE)
-    logs_table = dynamodb.Table(LOGS_TABLE)
-    
     processed_count = 0
+    missing_log_count = 0
     errors = []
     
+    # All rows in one file are compared against the same point in time
+    now = datetime.utcnow()
+    
+    # Prepared rows are written a batch at a time, so only one batch is held in memory
+    # and a failed write only loses that batch
+    batch_rows = []
+    
     for index, row in df.iterrows():
         try:
             # Generate unique certificate ID
             cert_id = str(uuid.uuid4())
             
             # Parse and prepare certificate data
-            cert_data = prepare_certificate_data(row, cert_id)
-            
-            # Insert into certificates table
-            certificates_table.put_item(Item=cert_data)
+            cert_data = prepare_certificate_data(row, cert_id, now)
             
             # Create log entry
             log_entry = create_log_entry(cert_id, "INITIAL_IMPORT", cert_data)
-            logs_table.put_item(Item=log_entry)
-            
-            processed_count += 1
-            logger.info(f"Processed certificate {processed_count}: {cert_data.get('CertificateName', 'Unknown')}")
             
         except Exception as e:
             error_msg = f"Error processing row {index}: {str(e)}"
             logger.error(error_msg)
             errors.append(error_msg)
+            continue
+        
+        batch_rows.append((index, cert_data, log_entry))
+        if len(batch_rows) == WRITE_BATCH_SIZE:
+            written, missing_logs = write_batch(batch_rows, errors)
+            processed_count += written
+            missing_log_count += missing_logs
+            batch_rows = []
+    
+    if batch_rows:
+        written, missing_logs = write_batch(batch_rows, errors)
+        processed_count += written
+        missing_log_count += missing_logs
     
     # Create processing summary
     summary = {
         'total_rows': len(df),
         'processed_successfully': processed_count,
+        'missing_log_entries': missing_log_count,
         'errors': len(errors),
         'error_details': errors[:10],  # Limit error details
         'processing_timestamp': datetime.utcnow().isoformat(),
@@ -122,6 +142,38 @@ def process_excel_file(bucket, key):
     logger.info(f"Processing completed. Summary: {summary}")
     return summary
 
+def write_batch(batch_rows, errors):
+    """
+    Write one batch of (row index, certificate, log entry) rows: certificates first,
+    then their log entries. Returns (certificates written, log entries missing);
+    a failed write is added to errors.
+    """
+    row_range = f"{batch_rows[0][0]}-{batch_rows[-1][0]}"
+    
+    try:
+        with certificates_table.batch_writer() as certificate_batch:
+            for _, cert_data, _ in batch_rows:
+                certificate_batch.put_item(Item=cert_data)
+    except ClientError as e:
+        error_msg = f"Error writing rows {row_range}: {str(e)}"
+        logger.error(error_msg)
+        errors.append(error_msg)
+        return 0, 0
+    
+    # Log entries only go out for certificates that were stored
+    try:
+        with logs_table.batch_writer() as log_batch:
+            for _, _, log_entry in batch_rows:
+                log_batch.put_item(Item=log_entry)
+    except ClientError as e:
+        error_msg = f"Rows {row_range} stored without INITIAL_IMPORT log entries: {str(e)}"
+        logger.error(error_msg)
+        errors.append(error_msg)
+        return len(batch_rows), len(batch_rows)
+    
+    logger.debug(f"Wrote batch of {len(batch_rows)} certificates")
+    return len(batch_rows), 0
+
 def map_excel_columns(columns):
     """
     Map Excel columns to standardized column names
@@ -166,18 +218,21 @@ def map_excel_columns(columns):
     
     return column_mapping
 
-def prepare_certificate_data(row, cert_id):
+def prepare_certificate_data(row, cert_id, now=None):
     """
     Prepare certificate data for DynamoDB insertion
     """
+    if now is None:
+        now = datetime.utcnow()
+    
     # Current timestamp
-    current_time = datetime.utcnow().isoformat()
+    current_time = now.isoformat()
     
     # Parse expiry date
     expiry_date = parse_expiry_date(row.get('ExpiryDate'))
     
     # Calculate status based on expiry date
-    status = calculate_certificate_status(expiry_date)
+    status = calculate_certificate_status(expiry_date, now)
     
     # Prepare the certificate data
     cert_data = {
@@ -244,7 +299,7 @@ def parse_expiry_date(date_value):
     logger.warning(f"Could not parse date: {date_value}")
     return date_str
 
-def calculate_certificate_status(expiry_date):
+def calculate_certificate_status(expiry_date, now=None):
     """
     Calculate certificate status based on expiry date
     """
@@ -252,8 +307,11 @@ def calculate_certificate_status(expiry_date):
         return "Unknown"
     
     try:
-        expiry = datetime.strptime(expiry_date, '%Y-%m-%d')
-        current = datetime.utcnow()
+        expiry = datetime.fromisoformat(expiry_date)
+        if expiry.tzinfo is not None:
+            # Unnormalised dates can carry an offset; compare in naive UTC like utcnow()
+            expiry = expiry.astimezone(timezone.utc).replace(tzinfo=None)
+        current = now or datetime.utcnow()
         days_until_expiry = (expiry - current).days
         
         if days_until_expiry < 0:
@@ -263,7 +321,7 @@ def calculate_certificate_status(expiry_date):
         else:
             return "Active"
             
-    except ValueError:
+    except (ValueError, TypeError):
         return "Unknown"
 
 def create_log_entry(cert_id, action, data):
@@ -1,54 +1,57 @@
 import json
+import base64
 import boto3
 import os
+import traceback
+from string import Template
 from datetime import datetime
 from decimal import Decimal
+from botocore.config import Config
+from botocore.exceptions import ClientError
 
-dynamodb = boto3.resource('dynamodb')
-ses = boto3.client('ses', region_name='eu-west-1')
+try:
+    import orjson
+except ImportError:  # not bundled in the deployment zip; fall back to stdlib json
+    orjson = None
+
+# Keep connections warm across invocations; fail fast instead of hanging the API response
+boto_config = Config(
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 3},
+    connect_timeout=1,
+    read_timeout=3
+)
+dynamodb = boto3.resource('dynamodb', config=boto_config)
+ses = boto3.client('ses', region_name='eu-west-1', config=boto_config)
+lambda_client = boto3.client('lambda', config=boto_config)
 table_name = os.environ.get('CERTIFICATES_TABLE', 'cert-management-dev-certificates')
 table = dynamodb.Table(table_name)
 
-def decimal_default(obj):
-    if isinstance(obj, Decimal):
-        return int(obj) if obj % 1 == 0 else float(obj)
-    raise TypeError
+# Largest request body accepted before JSON parsing; certificate payloads are a few hundred bytes
+MAX_BODY_BYTES = 64 * 1024
 
-def send_status_change_notification(certificate, old_status, new_status, notes='', incident_number=''):
-    """Send email notification when certificate status changes"""
-    try:
-        owner_email = certificate.get('Owner', '')
-        support_email = certificate.get('SupportEmail', '')
-        cert_name = certificate.get('CertificateName', 'Unknown')
-        environment = certificate.get('Environment', 'Unknown')
-        
-        # Build email recipients
-        recipients = []
-        if owner_email and '@' in owner_email:
-            recipients.append(owner_email)
-        if support_email and '@' in support_email and support_email not in recipients:
-            recipients.append(support_email)
-        
-        if not recipients:
-            print(f"No valid email recipients for certificate {cert_name}")
-            return
-        
-        # Build email subject
-        subject = f"Certificate Status Changed: {cert_name} ({environment})"
-        
-        # Build email body
-        body_html = f"""
+# Fields the dashboard edits; a PUT only skips the write when none of these differ from what's stored.
+# The checks are bounded by this set rather than by the client's body, keeping the ConditionExpression small.
+EDITABLE_FIELDS = frozenset((
+    'CertificateName', 'Environment', 'Application', 'ExpiryDate', 'Type', 'OwnerEmail',
+    'SupportEmail', 'AccountNumber', 'Status', 'DaysUntilExpiry', 'Notes'
+))
+# Client-sent timestamps change on every request, so they never count as a change
+TIMESTAMP_FIELDS = frozenset(('UpdatedAt', 'LastUpdatedOn', 'LastModified'))
+
+# Status-change email bodies, parsed once per container
+STATUS_CHANGE_HTML = Template("""
         <html>
         <head>
             <style>
-                body {{ font-family: Arial, sans-serif; }}
-                .header {{ background-color: #667eea; color: white; padding: 20px; }}
-                .content {{ padding: 20px; }}
-                .info-table {{ border-collapse: collapse; width: 100%; margin: 20px 0; }}
-                .info-table th {{ background-color: #f2f2f2; padding: 10px; text-align: left; border: 1px solid #ddd; }}
-                .info-table td {{ padding: 10px; border: 1px solid #ddd; }}
-                .status-change {{ background-color: #fff3cd; padding: 15px; border-left: 4px solid #ffc107; margin: 20px 0; }}
-                .footer {{ color: #666; font-size: 12px; margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; }}
+                body { font-family: Arial, sans-serif; }
+                .header { background-color: #667eea; color: white; padding: 20px; }
+                .content { padding: 20px; }
+                .info-table { border-collapse: collapse; width: 100%; margin: 20px 0; }
+                .info-table th { background-color: #f2f2f2; padding: 10px; text-align: left; border: 1px solid #ddd; }
+                .info-table td { padding: 10px; border: 1px solid #ddd; }
+                .status-change { background-color: #fff3cd; padding: 15px; border-left: 4px solid #ffc107; margin: 20px 0; }
+                .footer { color: #666; font-size: 12px; margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; }
             </style>
         </head>
         <body>
@@ -61,33 +64,33 @@ def send_status_change_notification(certificate, old_status, new_status, notes='
                 <table class="info-table">
                     <tr>
                         <th>Certificate Name</th>
-                        <td>{cert_name}</td>
+                        <td>$cert_name</td>
                     </tr>
                     <tr>
                         <th>Environment</th>
-                        <td>{environment}</td>
+                        <td>$environment</td>
                     </tr>
                     <tr>
                         <th>Application</th>
-                        <td>{certificate.get('ApplicationName', 'N/A')}</td>
+                        <td>$application</td>
                     </tr>
                     <tr>
                         <th>Expiry Date</th>
-                        <td>{certificate.get('ExpiryDate', 'N/A')}</td>
+                        <td>$expiry_date</td>
                     </tr>
                     <tr>
                         <th>Days Until Expiry</th>
-                        <td>{certificate.get('DaysUntilExpiry', 'N/A')}</td>
+                        <td>$days_until_expiry</td>
                     </tr>
                 </table>
                 
                 <div class="status-change">
                     <h3>Status Change Details</h3>
-                    <p><strong>Previous Status:</strong> {old_status or 'N/A'}</p>
-                    <p><strong>New Status:</strong> <span style="color: #667eea; font-weight: bold;">{new_status}</span></p>
-                    {f'<p><strong>Incident Number:</strong> {incident_number}</p>' if incident_number else ''}
-                    {f'<p><strong>Notes:</strong> {notes}</p>' if notes else ''}
-                    <p><strong>Changed At:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
+                    <p><strong>Previous Status:</strong> $old_status</p>
+                    <p><strong>New Status:</strong> <span style="color: #667eea; font-weight: bold;">$new_status</span></p>
+                    $incident_html
+                    $notes_html
+                    <p><strong>Changed At:</strong> $changed_at</p>
                 </div>
                 
                 <p>Please take appropriate action if required.</p>
@@ -99,30 +102,86 @@ def send_status_change_notification(certificate, old_status, new_status, notes='
             </div>
         </body>
         </html>
-        """
-        
-        body_text = f"""
+        """)
+
+STATUS_CHANGE_TEXT = Template("""
 Certificate Status Change Notification
 
 The status of the following certificate has been updated:
 
-Certificate Name: {cert_name}
-Environment: {environment}
-Application: {certificate.get('ApplicationName', 'N/A')}
-Expiry Date: {certificate.get('ExpiryDate', 'N/A')}
-Days Until Expiry: {certificate.get('DaysUntilExpiry', 'N/A')}
+Certificate Name: $cert_name
+Environment: $environment
+Application: $application
+Expiry Date: $expiry_date
+Days Until Expiry: $days_until_expiry
 
 Status Change Details:
-Previous Status: {old_status or 'N/A'}
-New Status: {new_status}
-{f'Incident Number: {incident_number}' if incident_number else ''}
-{f'Notes: {notes}' if notes else ''}
-Changed At: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+Previous Status: $old_status
+New Status: $new_status
+$incident_text
+$notes_text
+Changed At: $changed_at
 
 Please take appropriate action if required.
 
 This is an automated notification from the Certificate Management System.
-        """
+        """)
+
+def decimal_default(obj):
+    if isinstance(obj, Decimal):
+        # int() + equality is cheaper than Decimal modulo and gives the same int/float split
+        as_int = int(obj)
+        return as_int if as_int == obj else float(obj)
+    raise TypeError
+
+def to_json(obj):
+    """Serialize a response body with orjson when it's packaged alongside the function"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=decimal_default).decode()
+    return json.dumps(obj, default=decimal_default)
+
+def send_status_change_notification(certificate, old_status, new_status, notes='', incident_number='', changed_at=''):
+    """Send email notification when certificate status changes"""
+    try:
+        owner_email = certificate.get('Owner', '')
+        support_email = certificate.get('SupportEmail', '')
+        cert_name = certificate.get('CertificateName', 'Unknown')
+        environment = certificate.get('Environment', 'Unknown')
+        application = certificate.get('ApplicationName', 'N/A')
+        expiry_date = certificate.get('ExpiryDate', 'N/A')
+        days_until_expiry = certificate.get('DaysUntilExpiry', 'N/A')
+        
+        # Build email recipients
+        recipients = []
+        if owner_email and '@' in owner_email:
+            recipients.append(owner_email)
+        if support_email and '@' in support_email and support_email not in recipients:
+            recipients.append(support_email)
+        
+        if not recipients:
+            print(f"No valid email recipients for certificate {cert_name}")
+            return
+        
+        # Build email subject
+        subject = f"Certificate Status Changed: {cert_name} ({environment})"
+        
+        # Build email body
+        fields = {
+            'cert_name': cert_name,
+            'environment': environment,
+            'application': application,
+            'expiry_date': expiry_date,
+            'days_until_expiry': days_until_expiry,
+            'old_status': old_status or 'N/A',
+            'new_status': new_status,
+            'incident_html': f'<p><strong>Incident Number:</strong> {incident_number}</p>' if incident_number else '',
+            'notes_html': f'<p><strong>Notes:</strong> {notes}</p>' if notes else '',
+            'incident_text': f'Incident Number: {incident_number}' if incident_number else '',
+            'notes_text': f'Notes: {notes}' if notes else '',
+            'changed_at': changed_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
+        }
+        body_html = STATUS_CHANGE_HTML.substitute(fields)
+        body_text = STATUS_CHANGE_TEXT.substitute(fields)
         
         # Send email via SES
         response = ses.send_email(
@@ -156,16 +215,61 @@ This is an automated notification from the Certificate Management System.
         # Don't fail the whole operation if email fails
         return None
 
+def queue_status_change_notification(context, **notification):
+    """Hand the notification to an async invocation of this function so the PUT response doesn't wait on SES"""
+    function_name = getattr(context, 'function_name', None)
+    if function_name:
+        try:
+            lambda_client.invoke(
+                FunctionName=function_name,
+                InvocationType='Event',
+                Payload=json.dumps({'status_change_notification': notification}, default=decimal_default)
+            )
+            return
+        except Exception as e:
+            print(f"Async notification dispatch failed, sending inline: {str(e)}")
+    send_status_change_notification(**notification)
+
 def lambda_handler(event, context):
     try:
-        print('Event:', json.dumps(event))
+        # Async re-entry queued by queue_status_change_notification
+        if 'status_change_notification' in event:
+            send_status_change_notification(**event['status_change_notification'])
+            return {'statusCode': 202}
         
         http_method = event.get('requestContext', {}).get('http', {}).get('method')
+        now = datetime.now()
+        raw_body = event.get('body') or '{}'
+        # Measure and parse the body as bytes: a str length counts characters, and
+        # Function URLs hand non-text payloads over base64-encoded
+        if event.get('isBase64Encoded'):
+            raw_body = base64.b64decode(raw_body)
+        else:
+            raw_body = raw_body.encode('utf-8')
+        
+        # Log the request shape only; dumping the whole event is a large CloudWatch write per call
+        print(f'{http_method} request, body {len(raw_body)} bytes')
+        
+        if len(raw_body) > MAX_BODY_BYTES:
+            return {
+                'statusCode': 413,
+                'headers': {'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'error': 'Request body too large'})
+            }
         
         # Handle GET request - list all certificates
         if http_method == 'GET':
+            # Follow LastEvaluatedKey so tables past the 1 MB scan page aren't silently truncated.
+            # Each page is serialized as it arrives, so only one page of items is held at a time.
+            page_chunks = []
             response = table.scan()
-            items = response.get('Items', [])
+            while True:
+                page_items = response.get('Items', [])
+                if page_items:
+                    page_chunks.append(to_json(page_items)[1:-1])
+                if 'LastEvaluatedKey' not in response:
+                    break
+                response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
             
             return {
                 'statusCode': 200,
@@ -173,18 +277,30 @@ def lambda_handler(event, context):
                     'Content-Type': 'application/json',
                     'Access-Control-Allow-Origin': '*'
                 },
-                'body': json.dumps(items, default=decimal_default)
+                'body': '[' + ','.join(page_chunks) + ']'
             }
         
         # Handle POST request - add new certificate
         elif http_method == 'POST':
-            body = json.loads(event.get('body', '{}'))
+            body = json.loads(raw_body)
             
             # Add timestamps
-            body['CreatedAt'] = datetime.now().isoformat()
-            body['UpdatedAt'] = datetime.now().isoformat()
+            body['CreatedAt'] = body['UpdatedAt'] = now.isoformat()
             
-            table.put_item(Item=body)
+            # Refuse to overwrite an existing certificate that happens to share the ID
+            try:
+                table.put_item(Item=body, ConditionExpression='attribute_not_exists(CertificateID)')
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+                return {
+                    'statusCode': 409,
+                    'headers': {
+                        'Content-Type': 'application/json',
+                        'Access-Control-Allow-Origin': '*'
+                    },
+                    'body': json.dumps({'error': 'Certificate already exists', 'CertificateID': body.get('CertificateID')})
+                }
             
             return {
                 'statusCode': 200,
@@ -192,12 +308,12 @@ def lambda_handler(event, context):
                     'Content-Type': 'application/json',
                     'Access-Control-Allow-Origin': '*'
                 },
-                'body': json.dumps({'message': 'Certificate added successfully', 'data': body}, default=decimal_default)
+                'body': to_json({'message': 'Certificate added successfully', 'data': body})
             }
         
         # Handle PUT request - update certificate or status
         elif http_method == 'PUT':
-            body = json.loads(event.get('body', '{}'))
+            body = json.loads(raw_body)
             cert_id = body.get('CertificateID')
             
             if not cert_id:
@@ -207,10 +323,6 @@ def lambda_handler(event, context):
                     'body': json.dumps({'error': 'CertificateID is required'})
                 }
             
-            # Get current certificate for comparison
-            current_cert = table.get_item(Key={'CertificateID': cert_id}).get('Item', {})
-            old_status = current_cert.get('Status', '')
-            
             # Check if this is a status update
             new_status = body.get('Status')
             notes = body.get('Notes', '')
@@ -224,10 +336,11 @@ def lambda_handler(event, context):
                     incident_number = incident_part
             
             # Update the certificate
-            body['UpdatedAt'] = datetime.now().isoformat()
+            body['UpdatedAt'] = now.isoformat()
             
             # Build update expression
-            update_expr = 'SET '
+            set_clauses = []
+            change_checks = []
             expr_attr_values = {}
             expr_attr_names = {}
             
@@ -237,26 +350,52 @@ def lambda_handler(event, context):
                     attr_value = f':{key}'
                     expr_attr_names[attr_name] = key
                     expr_attr_values[attr_value] = value
-                    update_expr += f'{attr_name} = {attr_value}, '
+                    set_clauses.append(f'{attr_name} = {attr_value}')
+                    if key in EDITABLE_FIELDS:
+                        change_checks.append(f'attribute_not_exists({attr_name}) OR {attr_name} <> {attr_value}')
             
-            update_expr = update_expr.rstrip(', ')
+            update_expr = 'SET ' + ', '.join(set_clauses)
+            update_kwargs = {}
+            # Any other field can't be compared within the bounded checks, so such a PUT is written unconditionally
+            if change_checks and body.keys() <= EDITABLE_FIELDS | TIMESTAMP_FIELDS | {'CertificateID'}:
+                # Only write when at least one submitted field differs from what's stored
+                update_kwargs['ConditionExpression'] = ' OR '.join(change_checks)
             
-            table.update_item(
-                Key={'CertificateID': cert_id},
-                UpdateExpression=update_expr,
-                ExpressionAttributeNames=expr_attr_names,
-                ExpressionAttributeValues=expr_attr_values
-            )
+            # ALL_OLD hands back the pre-update item, so no separate read is needed for comparison
+            try:
+                current_cert = table.update_item(
+                    Key={'CertificateID': cert_id},
+                    UpdateExpression=update_expr,
+                    ExpressionAttributeNames=expr_attr_names,
+                    ExpressionAttributeValues=expr_attr_values,
+                    ReturnValues='ALL_OLD',
+                    **update_kwargs
+                ).get('Attributes', {})
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+                print(f"No changes for certificate {cert_id}; skipping update")
+                return {
+                    'statusCode': 200,
+                    'headers': {
+                        'Content-Type': 'application/json',
+                        'Access-Control-Allow-Origin': '*'
+                    },
+                    'body': json.dumps({'message': 'Certificate unchanged'})
+                }
+            old_status = current_cert.get('Status', '')
             
             # Send notification if status changed
             if new_status and new_status != old_status:
                 print(f"Status changed from '{old_status}' to '{new_status}'. Sending notification...")
-                send_status_change_notification(
+                queue_status_change_notification(
+                    context,
                     certificate=current_cert,
                     old_status=old_status,
                     new_status=new_status,
                     notes=notes,
-                    incident_number=incident_number
+                    incident_number=incident_number,
+                    changed_at=now.strftime('%Y-%m-%d %H:%M:%S UTC')
                 )
             
             return {
@@ -299,7 +438,6 @@ def lambda_handler(event, context):
     
     except Exception as e:
         print(f'Error: {str(e)}')
-        import traceback
         traceback.print_exc()
         
         return {
@@ -3,14 +3,13 @@
 Quick test to verify Python environment and AWS connectivity
 """
 
-import boto3
-from decimal import Decimal
-
 def test_dynamodb_connection():
     """Test connection to DynamoDB and read certificate data"""
     print("🔍 Testing AWS DynamoDB connection...")
     
     try:
+        import boto3
+        
         # Create DynamoDB resource
         dynamodb = boto3.resource('dynamodb', region_name='eu-west-1')
         table = dynamodb.Table('cert-management-dev-certificates')
@@ -19,7 +18,12 @@ def test_dynamodb_connection():
         print(f"✅ Table: {table.table_name}")
         
         # Scan for a few certificates
-        response = table.scan(Limit=3)
+        # Only the attributes printed below are fetched
+        response = table.scan(
+            Limit=3,
+            ProjectionExpression='CertificateID, CommonName, ExpiryDate, #s, Environment',
+            ExpressionAttributeNames={'#s': 'Status'}
+        )
         count = response.get('Count', 0)
         
         print(f"✅ Retrieved {count} sample certificates")
@@ -34,11 +38,11 @@ def test_dynamodb_connection():
                 print(f"    Status: {cert.get('Status', 'N/A')}")
                 print(f"    Environment: {cert.get('Environment', 'N/A')}")
         
-        # Get total count
+        # Get total count from table metadata instead of a full COUNT scan;
+        # DynamoDB refreshes ItemCount roughly every six hours, so it's approximate
         print("\n🔢 Getting total certificate count...")
-        scan_response = table.scan(Select='COUNT')
-        total = scan_response.get('Count', 0)
-        print(f"✅ Total certificates in DynamoDB: {total}")
+        total = dynamodb.meta.client.describe_table(TableName=table.table_name)['Table']['ItemCount']
+        print(f"✅ Total certificates in DynamoDB (approximate): {total}")
         
         return True
         
@@ -5,6 +5,13 @@ Test script to verify Python environment configuration
 
 import sys
 import platform
+import functools
+
+@functools.cache
+def get_session():
+    """One boto3 Session for the whole run, so the credential chain is resolved once"""
+    import boto3
+    return boto3.Session()
 
 def test_python_version():
     """Check Python version"""
@@ -20,7 +27,7 @@ def test_boto3():
         
         # Test AWS connection (optional)
         try:
-            session = boto3.Session()
+            session = get_session()
             region = session.region_name or 'eu-west-1'
             print(f"✅ AWS Session created (Region: {region})")
         except Exception as e:
@@ -57,8 +64,7 @@ def test_excel_read():
 def test_dynamodb_client():
     """Test DynamoDB client creation"""
     try:
-        import boto3
-        dynamodb = boto3.client('dynamodb', region_name='eu-west-1')
+        dynamodb = get_session().client('dynamodb', region_name='eu-west-1')
         print(f"✅ DynamoDB client created successfully")
         return True
     except Exception as e:
@@ -1,34 +1,83 @@
 import boto3
-from boto3.dynamodb.conditions import Attr
+import functools
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+
+# Parallel scan segments; each worker scans one and updates the certificates it finds
+SEGMENTS = 8
+
+# Only the two owner attributes are written; the rest of each item never leaves DynamoDB
+OWNER_UPDATE_EXPRESSION = 'SET #owner = :owner, SupportTeam = :support_team'
+OWNER_ATTR_NAMES = {'#owner': 'Owner'}
+OWNER_VALUES = {
+    ':owner': 'vinaya-c.nayanegali@capgemini.com',
+    ':support_team': 'Support Team'
+}
+
+# Pooled, kept-alive connections for every segment worker; adaptive retries back off on throttling
+boto_config = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 10}
+)
+
+@functools.cache
+def get_dynamodb(region='eu-west-1'):
+    """DynamoDB resource, built once per region and reused"""
+    return boto3.resource('dynamodb', region_name=region, config=boto_config)
+
+@functools.cache
+def get_table(name, region='eu-west-1'):
+    """Table handle, built once per (name, region) and reused"""
+    return get_dynamodb(region).Table(name)
 
 # Initialize DynamoDB
-dynamodb = boto3.resource('dynamodb', region_name='eu-west-1')
-table = dynamodb.Table('cert-management-dev-certificates')
+table = get_table('cert-management-dev-certificates')
 
-print("Updating all certificates with new owner email...")
+# Segment workers share the table's underlying client: clients are thread-safe, resources are not
+client = table.meta.client
 
-# Scan all certificates
-response = table.scan()
-items = response['Items']
+def iter_items(**scan_kwargs):
+    """Yield scanned items page by page, following LastEvaluatedKey, so no page outlives its processing"""
+    while True:
+        response = client.scan(TableName=table.name, **scan_kwargs)
+        yield from response['Items']
+        
+        # Handle pagination if there are more items
+        if 'LastEvaluatedKey' not in response:
+            return
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
 
-# Handle pagination if there are more items
-while 'LastEvaluatedKey' in response:
-    response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-    items.extend(response['Items'])
+def update_segment(segment):
+    """Scan one segment's keys and set the new owner on each certificate; returns how many were updated"""
+    updated = 0
+    for item in iter_items(Segment=segment, TotalSegments=SEGMENTS, ProjectionExpression='CertificateID'):
+        # attribute_exists keeps a certificate deleted since the scan from being recreated
+        try:
+            client.update_item(
+                TableName=table.name,
+                Key={'CertificateID': item['CertificateID']},
+                UpdateExpression=OWNER_UPDATE_EXPRESSION,
+                ConditionExpression='attribute_exists(CertificateID)',
+                ExpressionAttributeNames=OWNER_ATTR_NAMES,
+                ExpressionAttributeValues=OWNER_VALUES
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            continue
+        updated += 1
+    return updated
 
-print(f"Found {len(items)} certificates to update")
+print("Updating all certificates with new owner email...")
 
-# Update each certificate
+# Update each certificate, all segments in parallel
 updated_count = 0
-with table.batch_writer() as batch:
-    for item in items:
-        item['Owner'] = 'vinaya-c.nayanegali@capgemini.com'
-        item['SupportTeam'] = 'Support Team'
-        batch.put_item(Item=item)
-        updated_count += 1
-        
-        if updated_count % 10 == 0:
-            print(f"Updated {updated_count} certificates...")
+with ThreadPoolExecutor(max_workers=SEGMENTS) as executor:
+    for segment_count in executor.map(update_segment, range(SEGMENTS)):
+        updated_count += segment_count
+        print(f"Updated {updated_count} certificates...")
 
 print(f"\n✅ Successfully updated {updated_count} certificates!")
 print(f"Owner: vinaya-c.nayanegali@capgemini.com")
@@ -1,26 +1,28 @@
 import boto3
+from botocore.config import Config
+
+# Kept-alive pooled connections for the scan pages and batch writes; adaptive retries back off on throttling
+boto_config = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 10}
+)
 
 # Initialize DynamoDB
-dynamodb = boto3.resource('dynamodb', region_name='eu-west-1')
+dynamodb = boto3.resource('dynamodb', region_name='eu-west-1', config=boto_config)
 table = dynamodb.Table('cert-management-dev-certificates')
 
 print("Updating support email for all certificates...")
 
-# Scan all certificates
-response = table.scan()
-items = response['Items']
-
-# Handle pagination
-while 'LastEvaluatedKey' in response:
-    response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-    items.extend(response['Items'])
-
-print(f"Found {len(items)} certificates to update")
+# Scan all certificates; the paginator follows LastEvaluatedKey and each page
+# is written back as it arrives instead of collecting the whole table first
+paginator = dynamodb.meta.client.get_paginator('scan')
+pages = paginator.paginate(TableName=table.name)
 
 # Update each certificate
 updated_count = 0
 with table.batch_writer() as batch:
-    for item in items:
+    for item in (item for page in pages for item in page['Items']):
         item['SupportEmail'] = 'vinaya-c.nayanegali@capgemini.com'
         batch.put_item(Item=item)
         updated_count += 1
@@ -2,66 +2,111 @@ import boto3
 import openpyxl
 from datetime import datetime
 import uuid
+import os
+import re
+import functools
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
+
+# Uploads go out as 25-item chunks (one BatchWriteItem each), several chunks in flight at once
+UPLOAD_CHUNK_SIZE = 25
+UPLOAD_WORKERS = 8
+
+# Third dash-separated part of the certificate name is its type, e.g. prd-app-TLS-01 -> TLS
+CERT_TYPE_PATTERN = re.compile(r'^[^-]*-[^-]*-([^-]+)')
+
+# Pooled, kept-alive connections for every upload worker; adaptive retries back off on throttling
+boto_config = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 10}
+)
+
+@functools.cache
+def get_dynamodb(region='eu-west-1'):
+    """DynamoDB resource, built once per region and reused"""
+    return boto3.resource('dynamodb', region_name=region, config=boto_config)
+
+@functools.cache
+def get_table(name, region='eu-west-1'):
+    """Table handle, built once per (name, region) and reused"""
+    return get_dynamodb(region).Table(name)
 
 # Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb', region_name='eu-west-1')
-table = dynamodb.Table('cert-management-dev-certificates')
+table = get_table('cert-management-dev-certificates')
 
-# Load the Excel file
-wb = openpyxl.load_workbook('dummy_certificates_100.xlsx')
+# Load the Excel file; read-only mode streams rows instead of building every Cell
+wb = openpyxl.load_workbook('dummy_certificates_100.xlsx', read_only=True, data_only=True)
 ws = wb.active
 
 print("Clearing existing certificates from DynamoDB...")
 
-# Scan and delete all existing items
+# Scan and delete all existing items; only keys are fetched, and every page is followed
 try:
-    scan = table.scan()
+    deleted_count = 0
+    scan_kwargs = {'ProjectionExpression': 'CertificateID'}
     with table.batch_writer() as batch:
-        for item in scan['Items']:
-            batch.delete_item(Key={'CertificateID': item['CertificateID']})
-    print(f"Deleted {len(scan['Items'])} existing certificates")
+        while True:
+            scan = table.scan(**scan_kwargs)
+            for item in scan['Items']:
+                batch.delete_item(Key={'CertificateID': item['CertificateID']})
+            deleted_count += len(scan['Items'])
+            
+            if 'LastEvaluatedKey' not in scan:
+                break
+            scan_kwargs['ExclusiveStartKey'] = scan['LastEvaluatedKey']
+    print(f"Deleted {deleted_count} existing certificates")
 except Exception as e:
     print(f"Error clearing table: {e}")
 
 print("\nUploading 100 new dummy certificates...")
 
-# Upload new certificates from Excel
+# Build new certificates from Excel; every row shares one upload timestamp
+items = []
+now_iso = datetime.now().isoformat()
+# Skip header row; max_col pads short rows so all seven columns always unpack
+for row_num, row in enumerate(ws.iter_rows(min_row=2, max_col=7, values_only=True), start=2):
+    cert_name, environment, application, expiry_date, owner, status, days_left = row
+    cert_type_match = CERT_TYPE_PATTERN.match(cert_name)
+    
+    # Create certificate item (CertificateID is assigned below)
+    items.append({
+        'CertificateName': cert_name,
+        'Environment': environment,
+        'ApplicationName': application,
+        'ExpiryDate': expiry_date,
+        'Owner': owner,
+        'Status': status,
+        'DaysUntilExpiry': int(days_left),
+        'CreatedAt': now_iso,
+        'UpdatedAt': now_iso,
+        'CertificateType': cert_type_match.group(1) if cert_type_match else 'SSL',
+        'Issuer': 'PostNL CA',
+        'Subject': f'CN={cert_name}',
+        'SerialNumber': f'SN-{row_num-1:05d}'
+    })
+
+wb.close()
+
+# One urandom read for every ID instead of one per row; version=4 keeps them standard random UUIDs
+random_bytes = os.urandom(16 * len(items))
+for index, item in enumerate(items):
+    item['CertificateID'] = str(uuid.UUID(bytes=random_bytes[index * 16:(index + 1) * 16], version=4))
+
+def upload_chunk(chunk):
+    """Write one chunk of certificates with its own batch writer; returns how many were written"""
+    with table.batch_writer() as batch:
+        for item in chunk:
+            batch.put_item(Item=item)
+    return len(chunk)
+
+# Upload the chunks in parallel
 uploaded_count = 0
-with table.batch_writer() as batch:
-    for row_num in range(2, ws.max_row + 1):  # Skip header row
-        cert_name = ws.cell(row=row_num, column=1).value
-        environment = ws.cell(row=row_num, column=2).value
-        application = ws.cell(row=row_num, column=3).value
-        expiry_date = ws.cell(row=row_num, column=4).value
-        owner = ws.cell(row=row_num, column=5).value
-        status = ws.cell(row=row_num, column=6).value
-        days_left = ws.cell(row=row_num, column=7).value
-        
-        # Create certificate item
-        cert_id = str(uuid.uuid4())
-        
-        item = {
-            'CertificateID': cert_id,
-            'CertificateName': cert_name,
-            'Environment': environment,
-            'ApplicationName': application,
-            'ExpiryDate': expiry_date,
-            'Owner': owner,
-            'Status': status,
-            'DaysUntilExpiry': int(days_left),
-            'CreatedAt': datetime.now().isoformat(),
-            'UpdatedAt': datetime.now().isoformat(),
-            'CertificateType': cert_name.split('-')[2] if '-' in cert_name else 'SSL',
-            'Issuer': 'PostNL CA',
-            'Subject': f'CN={cert_name}',
-            'SerialNumber': f'SN-{row_num-1:05d}'
-        }
-        
-        batch.put_item(Item=item)
-        uploaded_count += 1
-        
-        if uploaded_count % 10 == 0:
-            print(f"Uploaded {uploaded_count} certificates...")
+chunks = [items[i:i + UPLOAD_CHUNK_SIZE] for i in range(0, len(items), UPLOAD_CHUNK_SIZE)]
+with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+    for chunk_count in executor.map(upload_chunk, chunks):
+        uploaded_count += chunk_count
+        print(f"Uploaded {uploaded_count} certificates...")
 
 print(f"\n✅ Successfully uploaded {uploaded_count} dummy certificates to DynamoDB!")
 print("\nCertificate distribution:")